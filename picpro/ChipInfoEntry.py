@@ -1,8 +1,10 @@
 import dataclasses
+import functools
+import struct
+from typing import Dict, List, Optional, Tuple
 from picpro.IChipInfoEntry import IChipInfoEntry
 from picpro.ProgrammingVars import ProgrammingVars
 from picpro.exceptions import FuseError
-from picpro.tools import indexwise_and
 
 
 @dataclasses.dataclass
@@ -46,24 +48,31 @@ class ChipInfoEntry(IChipInfoEntry):
         'newf12b': None  # !FIXME Not in docs
     }
 
-    _power_sequence_dict = {
-        'Vcc': 0,
-        'VccVpp1': 1,
-        'VccVpp2': 2,
-        'Vpp1Vcc': 3,
-        'Vpp2Vcc': 4,
-        'VccFastVpp1': 1,
-        'VccFastVpp2': 2
+    _core_bits_dict = {
+        'bit16_a': 16,
+        'bit16_b': 16,
+        'bit16_c': 16,
+        'bit14_a': 14,
+        'bit14_b': 14,
+        'bit14_c': 14,
+        'bit14_d': 14,
+        'bit14_e': 14,
+        'bit14_f': 14,
+        'bit14_g': 14,
+        'bit14_h': 14,
+        'bit12_a': 12,
+        'bit12_b': 12
     }
 
-    _vcc_vpp_delay_dict = {
-        'Vcc': False,
-        'VccVpp1': False,
-        'VccVpp2': False,
-        'Vpp1Vcc': False,
-        'Vpp2Vcc': False,
-        'VccFastVpp1': True,
-        'VccFastVpp2': True
+    # Power sequence: (power sequence sent to programmer, vcc vpp delay flag)
+    _power_sequence_dict = {
+        'Vcc': (0, False),
+        'VccVpp1': (1, False),
+        'VccVpp2': (2, False),
+        'Vpp1Vcc': (3, False),
+        'Vpp2Vcc': (4, False),
+        'VccFastVpp1': (1, True),
+        'VccFastVpp2': (2, True)
     }
 
     _socket_image_dict = {
@@ -74,6 +83,34 @@ class ChipInfoEntry(IChipInfoEntry):
         '40pin': 'socket pin 1'
     }
 
+    @functools.cached_property
+    def _fuse_masks(self) -> Dict[str, Dict[str, List[int]]]:
+        # Expand (index, value) pairs of every fuse setting into a mask with a word for each fuse,
+        # words not affected by the setting are 0xffff. Fuse encoding/decoding is then a plain word-wise AND.
+        # Built on first use only, a reader holds every chip but only one is programmed.
+        fuse_masks = {}
+        for fuse_param, fuse_settings in self.fuses.items():
+            setting_masks = {}
+            for setting, setting_value in fuse_settings.items():
+                mask = [0xffff] * len(self.fuse_blank)
+                for (index, value) in setting_value:
+                    mask[index] = value
+                setting_masks[setting] = mask
+            fuse_masks[fuse_param] = setting_masks
+        return fuse_masks
+
+    @functools.cached_property
+    def _fuse_packed_masks(self) -> Dict[str, Dict[str, Tuple[int, int]]]:
+        # For decoding, every mask is also packed into a single int together with the number of bits it clears.
+        fuse_packed_masks: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        all_bits = (1 << (16 * len(self.fuse_blank))) - 1
+        for fuse_param, setting_masks in self._fuse_masks.items():
+            fuse_packed_masks[fuse_param] = {}
+            for setting, mask in setting_masks.items():
+                packed_mask = self._pack_fuse_words(mask)
+                fuse_packed_masks[fuse_param][setting] = (packed_mask, bin(~packed_mask & all_bits).count('1'))
+        return fuse_packed_masks
+
     def to_dict(self) -> dict:
         return {
             'chip_name': self.chip_name,
@@ -105,6 +142,8 @@ class ChipInfoEntry(IChipInfoEntry):
         if not core_type_int:
             raise ValueError('Failed to identify core_type')
 
+        power_sequence, vcc_vpp_delay = self._power_sequence_dict[self.power_sequence]
+
         return ProgrammingVars(
             rom_size=self.rom_size,
             eeprom_size=self.eeprom_size,
@@ -113,9 +152,9 @@ class ChipInfoEntry(IChipInfoEntry):
             flag_band_gap_fuse=self.band_gap,
             # T.Nixon says this is the rule for this flag.
             flag_18f_single_panel_access_mode=self.core_type == 'bit16_a',
-            flag_vcc_vpp_delay=self._vcc_vpp_delay_dict[self.power_sequence],
+            flag_vcc_vpp_delay=vcc_vpp_delay,
             program_delay=self.program_delay,
-            power_sequence=self._power_sequence_dict[self.power_sequence],
+            power_sequence=power_sequence,
             erase_mode=self.erase_mode,
             program_retries=self.program_tries,
             over_program=self.over_program,
@@ -123,65 +162,66 @@ class ChipInfoEntry(IChipInfoEntry):
         )
 
     def get_core_bits(self) -> int:
-
-        if self.core_type in ['bit16_a', 'bit16_b', 'bit16_c']:
-            return 16
-        if self.core_type in ['bit14_a', 'bit14_b', 'bit14_c', 'bit14_d', 'bit14_e', 'bit14_f', 'bit14_g', 'bit14_h']:
-            return 14
-        if self.core_type in ['bit12_a', 'bit12_b']:
-            return 12
-
-        raise ValueError('Failed to detect core bits')
+        core_bits = self._core_bits_dict.get(self.core_type)
+        if core_bits is None:
+            raise ValueError('Failed to detect core bits')
+
+        return core_bits
+
+    @staticmethod
+    def _pack_fuse_words(words: list) -> int:
+        return int.from_bytes(struct.pack('>{}H'.format(len(words)), *words), 'big')
+
+    @staticmethod
+    def _find_fuse_setting(packed_values: int, fuse_settings: Dict[str, Tuple[int, int]]) -> Optional[str]:
+        """Given packed fuse values and packed masks of all settings of a single fuse,
+        return name of the setting that is active or None when there is no such setting."""
+        # Fuse setting is active if ((fuse_value & setting) ==
+        # (fuse_value))
+        # We need to check all fuse values to find the best one.
+        # The best is the one which clears the most bits and still
+        # matches, first one wins on a tie. Setting that clears
+        # no bits is the fallback when nothing more specific matches.
+        best_cleared_bits = -1
+        best_setting = None
+        for setting, (packed_mask, cleared_bits) in fuse_settings.items():
+            if (packed_values & packed_mask) == packed_values and cleared_bits > best_cleared_bits:
+                best_cleared_bits = cleared_bits
+                best_setting = setting
+
+        return best_setting
 
     def decode_fuse_data(self, fuse_values: list) -> dict:
         """Given a list of fuse values, return a dict of symbolic
         (fuse : value) mapping representing the fuses that are set."""
 
-        fuse_param_list = self.fuses
+        # Packed words are compared bit by bit with packed masks, so word counts must match.
+        if len(fuse_values) != len(self.fuse_blank):
+            raise FuseError('Expected {} fuse words, got {}.'.format(len(self.fuse_blank), len(fuse_values)))
+
         result = {}
+        packed_values = self._pack_fuse_words(fuse_values)
 
-        for fuse_param in fuse_param_list:
-            fuse_settings = fuse_param_list[fuse_param]
-
-            # Try to determine which of the settings for this fuse is
-            # active.
-            # Fuse setting is active if ((fuse_value & setting) ==
-            # (fuse_value))
-            # We need to check all fuse values to find the best one.
-            # The best is the one which clears the most bits and still
-            # matches.  So we start with a best_value of 0xffff (no
-            # bits cleared.)
-            best_value = [0xffff] * len(fuse_values)
-            fuse_identified = False
-            for setting in fuse_settings:
-                setting_value = fuse_settings[setting]
-
-                if indexwise_and(fuse_values, setting_value) == fuse_values:
-                    # If this setting value clears more bits than
-                    # best_value, it's our new best value.
-                    if indexwise_and(best_value, setting_value) != best_value:
-                        best_value = indexwise_and(best_value, setting_value)
-                        result[fuse_param] = setting
-                        fuse_identified = True
-            if not fuse_identified:
+        for fuse_param, fuse_settings in self._fuse_packed_masks.items():
+            # Try to determine which of the settings for this fuse is active.
+            setting = self._find_fuse_setting(packed_values, fuse_settings)
+            if setting is None:
                 raise FuseError('Could not identify fuse setting.')
+            result[fuse_param] = setting
 
         return result
 
     def encode_fuse_data(self, fuse_dict: dict) -> list:
         result = list(self.fuse_blank)
-        fuse_param_list = self.fuses
-        for fuse in fuse_dict:
-            fuse_value = fuse_dict[fuse]
-
-            if fuse not in fuse_param_list:
+        for fuse, fuse_value in fuse_dict.items():
+            fuse_settings = self._fuse_masks.get(fuse)
+            if fuse_settings is None:
                 raise FuseError('Unknown fuse "{}".'.format(fuse))
-            fuse_settings = fuse_param_list[fuse]
 
             if fuse_value not in fuse_settings:
                 raise FuseError('Invalid fuse setting: "{}" = "{}"'.format(fuse, fuse_value))
 
-            result = indexwise_and(result, fuse_settings[fuse_value])
+            result = [value & mask for value, mask in zip(result, fuse_settings[fuse_value])]
 
         return result
 
@@ -191,18 +231,20 @@ class ChipInfoEntry(IChipInfoEntry):
     def pin1_location_text(self) -> str:
         return self._socket_image_dict[self.socket_image]
 
+    @functools.cached_property
+    def _fuse_doc(self) -> str:
+        result = []
+        for fuse, fuse_settings in self.fuses.items():
+            settings = ', '.join('\'{}\''.format(setting) for setting in fuse_settings)
+            result.append('\'{}\' : ({})\n'.format(fuse, settings))
+        return ''.join(result)
+
     def fuse_doc(self) -> str:
-        result = ''
-        fuse_param_list = self.fuses
-        for fuse in fuse_param_list:
-            fuse_settings = fuse_param_list[fuse]
-
-            result = result + '\'' + fuse + '\' : ('
-            first = True
-            for setting in fuse_settings:
-                if not first:
-                    result = result + ', '
-                result = result + '\'' + setting + '\''
-                first = False
-            result = result + ')\n'
-        return result
+        return self._fuse_doc
+
+    @functools.cached_property
+    def _fuse_blank_data(self) -> bytes:
+        return struct.pack('>{}H'.format(len(self.fuse_blank)), *self.fuse_blank)
+
+    def fuse_blank_data(self) -> bytes:
+        return self._fuse_blank_data
@@ -14,7 +14,7 @@ def handle_int(input_str: str) -> int:
 
 
 def handle_fuse_blank(input_str: str) -> List[int]:
-    return [int(x, 16) for x in input_str.strip().split(' ')]
+    return [int(x, 16) for x in input_str.split()]
 
 
 def handle_lower(input_str: str) -> str:
@@ -28,14 +28,17 @@ def handle_bool(input_str: str) -> Optional[bool]:
         'n': False,
         '0': False
     }
-    return boolean_dict.get(input_str)
+    return boolean_dict.get(input_str.lower())
 
 
 class ChipInfoReader:
-    chip_entries: Dict[str, ChipInfoEntry] = {}
-    assignment_regexp = re.compile(r'^(\S+)\s*=\s*(.*)\s*$')
+    chip_entries: Dict[str, ChipInfoEntry]
+    # Matches either assignment line or fuse list line, so each line is matched only once
+    line_regexp = re.compile(
+        r'^(?:(?P<key>\S+)\s*=\s*(?P<value>.*)\s*'
+        r'|LIST\d+\s+FUSE(?P<fuse>\d)\s+"(?P<name>[^"]*)"\s*(?P<values>.*))$'
+    )
     fuse_value_regexp = re.compile(r'"([^"]*)"\s*=\s*([0-9a-fA-F]+(?:&[0-9a-fA-F]+)*)')
-    fuse_list_regexp = re.compile(r'^LIST\d+\s+FUSE(?P<fuse>\d)\s+"(?P<name>[^"]*)"\s*(?P<values>.*)$')
     non_blank_regexp = re.compile(r'.*\S.*$')
 
     # Class for reading chipinfo files, which provide information about different types of PICs.
@@ -64,7 +67,12 @@ class ChipInfoReader:
         'PanelSizing': 'panel_sizing'
     }
 
-    def __init__(self, file_name: str):
+    def __init__(self, file_name: str, chip_name: Optional[str] = None):
+        """Reads all chips from file_name, or only the chip named chip_name when given."""
+        # Entries are per instance, so readers of different (or modified) files do not share chips
+        self.chip_entries = {}
+        if chip_name is not None:
+            chip_name = handle_lower(chip_name)
         self.special_handlers = {
             'chip_name': handle_lower,
             'band_gap': handle_bool,
@@ -89,17 +97,27 @@ class ChipInfoReader:
             block: Optional[dict] = None
             lines = file.readlines()
             number_of_lines = len(lines)
+            skip_block = False
             for line_index, line in enumerate(lines):
                 line_number = line_index + 1
                 try:
                     stripped_line = line.strip()
-                    if stripped_line:
+                    if not stripped_line:
+                        skip_block = False
+                    elif skip_block:
+                        continue
+                    else:
                         # We have line, add to current block
                         if not block:
                             block = {
                                 'fuses': {}
                             }
                         self.parse_line(block, stripped_line, line_number)
+                        if chip_name is not None and block.get('chip_name', chip_name) != chip_name:
+                            # Not the chip we are looking for, rest of its block is not parsed
+                            skip_block = True
+                            block = None
+                            continue
                     if block and (not stripped_line or line_number == number_of_lines):
                         # Empty line or end of file means end of block
                         # @TODO We don't know what these are doing?!
@@ -111,49 +129,50 @@ class ChipInfoReader:
                         block['over_program'] = block.get('over_program', 0)
                         self.chip_entries[block['chip_name']] = ChipInfoEntry(**block)
                         block = None
+                        if chip_name in self.chip_entries:
+                            # Requested chip is read, rest of the file is not needed
+                            break
                 except FormatError as e:
                     # Destroy this block
                     block = None
                     logging.error('Parsing of line %s failed, ignoring whole block...', line_number, exc_info=e)
 
     def parse_line(self, block: dict, line: str, line_number: int) -> None:
-        match_assignment_regexp = self.assignment_regexp.match(line)
-        if match_assignment_regexp:
-            lhs_raw, rhs = match_assignment_regexp.groups()
+        match_line_regexp = self.line_regexp.match(line)
+        if not match_line_regexp:
+            if self.non_blank_regexp.match(line):
+                raise FormatError('Unrecognized line format {}'.format(line))
+            return
+
+        if match_line_regexp.group('key') is not None:
+            lhs_raw, rhs = match_line_regexp.group('key', 'value')
             lhs = self.chip_info_key_replacements.get(lhs_raw)
             if lhs is None:
                 raise FormatError('Key replacement is None for {}'.format(lhs_raw))
             try:
-                found_special_handler = self.special_handlers.get(lhs)
-                if found_special_handler:
-                    block[lhs] = found_special_handler(rhs.lower())
-                else:
-                    block[lhs] = rhs
+                special_handler = self.special_handlers.get(lhs)
+                block[lhs] = special_handler(rhs) if special_handler else rhs
             except NameError as e:
                 # Some extraneous line in the file...  do we care?
                 raise FormatError('Assignment outside of chip definition @{}: {}'.format(line_number, line)) from e
 
         else:
-            match_fuse_list_regexp = self.fuse_list_regexp.match(line)
-            if match_fuse_list_regexp:
-                fuse, name, values_string = match_fuse_list_regexp.groups()
-
-                fuses = {}
-                values = self.fuse_value_regexp.findall(values_string)
-                for value_pair in values:
-                    lhs, rhs = value_pair
-                    # rhs may have multiple fuse values, in the form
-                    #   xxxx&xxxx&xxxx...
-                    # This means that each xxxx applies to the next
-                    # consecutive fuse.
-                    fuse_values = [int(xstr, 16) for xstr in rhs.split('&')]
-                    fuse_number = int(fuse)
-
-                    fuses[lhs] = list(zip(range(fuse_number - 1, (fuse_number + len(fuse_values) - 1)), fuse_values))
-
-                block['fuses'][name] = fuses
-            elif self.non_blank_regexp.match(line):
-                raise FormatError('Unrecognized line format {}'.format(line))
+            fuse, name, values_string = match_line_regexp.group('fuse', 'name', 'values')
+
+            fuses = {}
+            values = self.fuse_value_regexp.findall(values_string)
+            for value_pair in values:
+                lhs, rhs = value_pair
+                # rhs may have multiple fuse values, in the form
+                #   xxxx&xxxx&xxxx...
+                # This means that each xxxx applies to the next
+                # consecutive fuse.
+                fuse_values = [int(xstr, 16) for xstr in rhs.split('&')]
+                fuse_number = int(fuse)
+
+                fuses[lhs] = list(zip(range(fuse_number - 1, (fuse_number + len(fuse_values) - 1)), fuse_values))
+
+            block['fuses'][name] = fuses
 
     def get_chip(self, name: str) -> ChipInfoEntry:
         return self.chip_entries[name.lower()]
@@ -1,45 +1,51 @@
-import re
+import binascii
 import struct
+from typing import List, Tuple
 
 from picpro.exceptions import InvalidRecordError, InvalidChecksumError
+from picpro.tools import merge_records
 
 
 class HexFileReader:
+    record_header_struct = struct.Struct('>BHB')
+
     def __init__(self, file_name: str):
-        with open(file_name, 'r', encoding='ascii') as file:
+        with open(file_name, 'rb') as file:
             seg_address = 0
             ext_address = 0
-            self.records = []
+            self.records: List[Tuple[int, bytes]] = []
             eof = False
-            for line in file:
-                hex_record_regexp = re.compile(r'^:[0-9a-fA-F]+$')
-                hex_record_chopper = re.compile(r'^:(..)(....)(..)(.*)(..)$')
-                if hex_record_regexp.match(line):
+            # Bound once, these are used for every record
+            append_record = self.records.append
+            unpack_header = self.record_header_struct.unpack_from
+            for raw_line in file:
+                line = raw_line.rstrip()
+                if line.startswith(b':'):
+                    # Decode the whole record at once, the checksum covers all of its bytes
+                    try:
+                        record = binascii.unhexlify(line[1:])
+                    except binascii.Error as e:
+                        raise InvalidRecordError('failed to parse line {}'.format(line.decode('ascii', 'replace'))) from e
+                    # Length, address, type and checksum bytes are mandatory
+                    if len(record) < 5:
+                        raise InvalidRecordError('failed to parse line {}'.format(line.decode('ascii', 'replace')))
                     if eof:
                         raise InvalidRecordError('extra record after EOF record.')
-                    chop = hex_record_chopper.match(line)
-                    if not chop:
-                        raise InvalidRecordError('failed to parse line {}'.format(line))
-                    length_str, address_str, type_str, data_str, checksum_str = chop.groups()
-                    length = int(length_str, 16)
-                    address = int(address_str, 16)
-                    record_type = int(type_str, 16)
-                    data = bytearray.fromhex(data_str)
-                    checksum = int(checksum_str, 16)
+                    length, address, record_type = unpack_header(record)
+                    data = record[4:-1]
+                    checksum = record[-1]
 
                     if length != len(data):
-                        raise InvalidRecordError('Incorrect data length: {} != {} ({})'.format(length, len(data), data_str))
+                        raise InvalidRecordError('Incorrect data length: {} != {} ({})'.format(length, len(data), data.hex()))
 
-                    checksum_test = 0
-                    for x in range(1, len(line) - 4, 2):
-                        checksum_test = (checksum_test + int(line[x:x + 2], 16)) % 256
-                    checksum_test = (256 - checksum_test) % 256
+                    # Sum of all record bytes including the checksum is 0 modulo 256
+                    checksum_test = (checksum - sum(record)) & 0xff
                     if checksum_test != checksum:
                         raise InvalidChecksumError('{} != {}'.format(checksum_test, checksum))
 
                     if record_type == 0:
                         # data record
-                        self.records.append(((address | ext_address)+seg_address, data))
+                        append_record(((address | ext_address)+seg_address, data))
                     elif record_type == 1:
                         # EOF record
                         eof = True
@@ -51,17 +57,7 @@ class HexFileReader:
                     else:
                         raise InvalidRecordError('Unknown record type ({})'.format(record_type))
                 elif len(line) != 0:
-                    raise InvalidRecordError('Record does not start with colon:  {}'.format(line))
+                    raise InvalidRecordError('Record does not start with colon:  {}'.format(line.decode('ascii', 'replace')))
 
     def merge(self, data_str: bytes) -> bytes:
-        data_list = bytearray(data_str)
-
-        for record in self.records:
-            (address, data) = record
-
-            if (address + len(data)) > len(data_list):
-                raise IndexError('Data record out of range.')
-
-            data_list[address:address + len(data)] = data
-
-        return bytes(data_list)
+        return bytes(merge_records(self.records, data_str))
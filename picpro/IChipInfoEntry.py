@@ -30,5 +30,9 @@ class IChipInfoEntry:
     def fuse_doc(self) -> str:
         raise NotImplementedError
 
+    def fuse_blank_data(self) -> bytes:
+        """Returns blank fuse words as big-endian bytes"""
+        raise NotImplementedError
+
     def to_dict(self) -> dict:
         raise NotImplementedError
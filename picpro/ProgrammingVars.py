@@ -2,7 +2,7 @@ import dataclasses
 from typing import List
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class ProgrammingVars:
     rom_size: int
     eeprom_size: int
@@ -9,6 +9,28 @@ from picpro.exceptions import InvalidValueError, InvalidResponseError, InvalidCo
 class ProtocolInterface:
     """A convenient interface to the DIY serial/USB PIC programmer kits"""
 
+    # Terminal responses of rom_is_blank() mapped to its result
+    _rom_is_blank_results = {
+        b'Y': True,
+        b'N': False,
+        b'C': False
+    }
+
+    # Precompiled layouts of command payloads and responses
+    _programming_vars_struct = struct.Struct('>HHBBBBBBB')
+    _config_struct = struct.Struct('<H8sHHHHHHHH')
+    # PROGRAM ID/FUSES body: '00' (ASCII), ID, fuses, 24 bytes for both cores
+    _id_fuses_16_bit_struct = struct.Struct('<2s8s7H')
+    # 14-bit ID is followed by 'FFFF' (ASCII), fuse and 12 bytes of 0xFF padding
+    _id_fuses_14_bit_struct = struct.Struct('<2s4s4sH12s')
+    _id_fuses_14_bit_trailer = b'\xff' * 12
+    # PROGRAM 18FXXXX FUSE body: all 0 in ID, then the fuse values
+    _fuses_18fxxxx_struct = struct.Struct('<10x7H')
+    # Command number followed by a word/byte count
+    _command_count_struct = struct.Struct('>cH')
+    _address_struct = struct.Struct('>I')
+    _byte_struct = struct.Struct('B')
+
     def __init__(self, port: serial.Serial):
         self.port = port
         # We need to set the port timeout to a small value and use
@@ -16,28 +38,52 @@ class ProtocolInterface:
         # time you set the timeout in the serial library, DTR goes
         # high, which resets any programmer other than the 149!
         self.port.timeout = .1
+        # Every command waits for the programmer's short acknowledgements, so where the serial
+        # driver supports it (Linux), have received bytes passed on immediately instead of batched.
+        if hasattr(self.port, 'set_low_latency_mode'):
+            try:
+                self.port.set_low_latency_mode(True)
+            except ValueError:
+                pass
         self.chip_info: Union[IChipInfoEntry, None] = None
         self.fuses_set = False
         self.firmware_type: Union[int, None] = None
+        # Snapshot of chip_info values used by commands, set by init_programming_vars()
+        self._rom_size = 0
+        self._eeprom_size = 0
+        self._core_bits = 0
         self.reset()
 
     def _read(self, count: int = 1, timeout: Union[int, float, None] = 5) -> bytes:
         # _read(count, timeout)
         # Read bytes from the port.  Stop when the requested number of
-        # bytes have been received, or the timeout has passed.  In order
-        # to sidestep issues with the serial library this is done by
-        # polling the serial port's read() method.
-        result = b''
-        init_time = time.time()
+        # bytes have been received, or the timeout has passed.  Port
+        # timeout is fixed (see __init__), every port read returns after
+        # at most .1 s and the timeout is checked between the reads.
+        # Monotonic clock, timeouts are not affected by system clock changes
         end_time = None
         if timeout is not None:
-            end_time = init_time + timeout
-        while (count > 0) and ((end_time is None) or (time.time() < end_time)):
-            read_result = self.port.read(count)
-            count = count - len(read_result)
-            result = result + read_result
-
-        return result
+            end_time = time.monotonic() + timeout
+
+        if count == 1:
+            # Single byte acknowledgements are the most common reads, no buffer is needed for them
+            response = self.port.read(1)
+            while not response and ((end_time is None) or (time.monotonic() < end_time)):
+                response = self.port.read(1)
+            return response
+
+        # Otherwise port.readinto() fills a preallocated buffer, received data is copied only once
+        result = bytearray(count)
+        view = memoryview(result)
+        received = 0
+        while (received < count) and ((end_time is None) or (time.monotonic() < end_time)):
+            received += self.port.readinto(view[received:])
+
+        # Release the view, the buffer can't be resized while it is exported
+        view.release()
+        # Short read on timeout, return only the data received
+        del result[received:]
+        return bytes(result)
 
     def _expect(self, expected: bytes, timeout: Union[int, float, None] = 10) -> None:
         """Raise an exception if the expected response byte is not sent by the PIC programmer before timeout."""
@@ -46,7 +92,7 @@ class ProtocolInterface:
             raise InvalidResponseError('expected "{!r}" received {!r}'.format(expected, response))
 
     def _need_chip_info(self) -> None:
-        if not self.chip_info:
+        if self.chip_info is None:
             raise InvalidCommandSequenceError('Chip info is not set')
 
     def _need_fuses(self) -> None:
@@ -58,6 +104,9 @@ class ProtocolInterface:
         self.chip_info = None
         self.fuses_set = False
         self.firmware_type = None
+        self._rom_size = 0
+        self._eeprom_size = 0
+        self._core_bits = 0
 
         self.port.setDTR(True)
         time.sleep(.1)
@@ -76,38 +125,34 @@ class ProtocolInterface:
             response = self._read(2, timeout=.3)
 
         if len(response) >= 1:
-            result = response[0].to_bytes(1, 'little') == b'B'
+            result = response[0:1] == b'B'
         else:
             result = False
         if result and len(response) == 2:
             self.firmware_type = response[1]
         return result
 
-    def _command_start(self, cmd: Optional[int] = None) -> bool:
+    def _command_start(self, cmd: Optional[bytes] = None) -> bool:
         # Send command 1: if we're at the jump table already this will
         # get us out.  If we're awaiting command start, this will
         # still echo 'Q' and await another command start.
-
-        self.port.write(b'\x01')
-        self._expect(b'Q')
-
-        # Start command, go to jump table.
-        self.port.write(b'P')
+        # Then start command, go to jump table, and send command number,
+        # if specified. Programmer handles these in order, so they are
+        # sent in a single write and both acknowledgements read after.
+        message = b'\x01P'
+        if cmd is not None:
+            message += cmd
+        self.port.write(message)
 
         # Check for acknowledgement
-        ack = self._read(1)
-        result = ack == b'P'
-        if not result:
-            raise InvalidResponseError('No acknowledgement for command start.')
+        ack = self._read(2, timeout=10)
+        if ack != b'QP':
+            raise InvalidResponseError('No acknowledgement for command start ({!r}).'.format(ack))
 
-        result = True
-        # Send command number, if specified
-        if cmd is not None:
-            self.port.write(cmd.to_bytes(1, 'little'))
-        return result
+        return True
 
     def _null_command(self) -> None:
-        cmd = 0
+        cmd = b'\x00'
         self.port.write(cmd)
 
     def _command_end(self) -> bool:
@@ -126,13 +171,14 @@ class ProtocolInterface:
         string.  Returns the PIC programmer's response."""
         cmd = b'\x02'
         self._command_start()
-        result = b''
 
-        for c in msg:
-            self.port.write(cmd)
-            self.port.write(c.to_bytes(1, 'little'))
-            response = self._read(1)
-            result = result + response
+        # Every message byte is preceded by the echo command. Programmer echoes
+        # each byte back as soon as it is received, so send them all at once.
+        message = bytearray(len(msg) * 2)
+        message[0::2] = cmd * len(msg)
+        message[1::2] = msg
+        self.port.write(message)
+        result = self._read(len(msg))
         self._command_end()
         return result
 
@@ -142,30 +188,31 @@ class ProtocolInterface:
 
         programing_vars = chip_info.programming_vars
 
+        power_sequence = programing_vars.power_sequence
         if icsp_mode:
-            if programing_vars.power_sequence == 2:
-                programing_vars.power_sequence = 1
-            elif programing_vars.power_sequence == 4:
-                programing_vars.power_sequence = 3
+            if power_sequence == 2:
+                power_sequence = 1
+            elif power_sequence == 4:
+                power_sequence = 3
 
-        cmd = 3
+        cmd = b'\x03'
         self._command_start(cmd)
 
+        # One bit per flag
         flags = (
-                (programing_vars.flag_calibration_value_in_rom and 1) |
-                (programing_vars.flag_band_gap_fuse and 2) |
-                (programing_vars.flag_18f_single_panel_access_mode and 4) |
-                (programing_vars.flag_vcc_vpp_delay and 8)
+                int(programing_vars.flag_calibration_value_in_rom) |
+                (int(programing_vars.flag_band_gap_fuse) << 1) |
+                (int(programing_vars.flag_18f_single_panel_access_mode) << 2) |
+                (int(programing_vars.flag_vcc_vpp_delay) << 3)
         )
 
-        command_payload = struct.pack(
-            '>HHBBBBBBB',
+        command_payload = self._programming_vars_struct.pack(
             programing_vars.rom_size,
             programing_vars.eeprom_size,
             programing_vars.core_type,
             flags,
             programing_vars.program_delay,
-            programing_vars.power_sequence,
+            power_sequence,
             programing_vars.erase_mode,
             programing_vars.program_retries,
             programing_vars.over_program
@@ -178,27 +225,32 @@ class ProtocolInterface:
         result = response == b'I'
         if result:
             self.chip_info = chip_info
+            self._rom_size = programing_vars.rom_size
+            self._eeprom_size = programing_vars.eeprom_size
+            self._core_bits = chip_info.get_core_bits()
         else:
             self.chip_info = None
         return result
 
-    def _set_programming_voltages_command(self, on: bool) -> bool:
-        """Turn the PIC programming voltages on or off.  Must be called as part of other commands which read or write PIC data."""
-        cmd_on = 4
-        cmd_off = 5
+    def _set_programming_voltages_command(self, on: bool, cmd: Optional[bytes] = None) -> bool:
+        """Turn the PIC programming voltages on or off.  Must be called as part of other commands which read or write PIC data.
+        Command to run with the voltages on can be passed in cmd, it is then sent in the same write.
+        Chip info is checked by the calling command."""
+        cmd_on = b'\x04'
+        cmd_off = b'\x05'
 
-        self._need_chip_info()
         if on:
-            self.port.write(cmd_on.to_bytes(1, 'little'))
+            # Programmer goes back to the jump table after acknowledging, queued command follows
+            self.port.write(cmd_on if cmd is None else cmd_on + cmd)
             expect = b'V'
         else:
-            self.port.write(cmd_off.to_bytes(1, 'little'))
+            self.port.write(cmd_off)
             expect = b'v'
         response = self._read(1)
         return response == expect
 
     def cycle_programming_voltages(self) -> bool:
-        cmd = 6
+        cmd = b'\x06'
         self._need_chip_info()
         self._command_start(cmd)
         response = self._read(1)
@@ -207,13 +259,12 @@ class ProtocolInterface:
 
     def program_rom(self, data: bytearray) -> bool:
         """Write data to ROM.  data should be a binary string of data, high byte first."""
-        cmd = 7
+        cmd = b'\x07'
         self._need_chip_info()
 
         word_count = len(data) // 2
-        rom_size = self.chip_info.programming_vars.rom_size  # type: ignore
-        if rom_size < word_count:
-            raise InvalidValueError('Data too large for PIC ROM {} > {}'.format(word_count, rom_size))
+        if self._rom_size < word_count:
+            raise InvalidValueError('Data too large for PIC ROM {} > {}'.format(word_count, self._rom_size))
 
         if ((word_count * 2) % 32) != 0:
             raise InvalidValueError('ROM data must be a multiple of 32 bytes in size.')
@@ -221,16 +272,14 @@ class ProtocolInterface:
         self._command_start()
         self._set_programming_voltages_command(True)
 
-        self.port.write(cmd.to_bytes(1, 'little'))
-
-        word_count_message = struct.pack('>H', word_count)
-        self.port.write(word_count_message)
+        self.port.write(self._command_count_struct.pack(cmd, word_count))
         self._expect(b'Y', timeout=20)
 
+        # Blocks are written straight out of data, slicing a memoryview doesn't copy
+        data_view = memoryview(data)
         try:
             for i in range(0, (word_count * 2), 32):
-                to_write = data[i:(i + 32)]
-                self.port.write(to_write)
+                self.port.write(data_view[i:(i + 32)])
                 self._expect(b'Y', timeout=20)
             self._expect(b'P', timeout=20)
         except InvalidResponseError:
@@ -243,11 +292,11 @@ class ProtocolInterface:
 
     def program_eeprom(self, data: bytes) -> bool:
         """Write data to EEPROM.  Data size must be small enough to fit in EEPROM."""
-        cmd = 8
+        cmd = b'\x08'
         self._need_chip_info()
 
         byte_count = len(data)
-        if self.chip_info.programming_vars.eeprom_size < byte_count:  # type: ignore
+        if self._eeprom_size < byte_count:
             raise InvalidValueError('Data too large for PIC EEPROM')
 
         if (byte_count % 2) != 0:
@@ -255,15 +304,15 @@ class ProtocolInterface:
 
         self._command_start()
         self._set_programming_voltages_command(True)
-        self.port.write(cmd.to_bytes(1, 'little'))
-
-        byte_count_message = struct.pack('>H', byte_count)
-        self.port.write(byte_count_message)
-
+        self.port.write(self._command_count_struct.pack(cmd, byte_count))
         self._expect(b'Y', timeout=20)
+        data_view = memoryview(data)
+        # Bound once, these run for every byte pair
+        write = self.port.write
+        expect = self._expect
         for i in range(0, byte_count, 2):
-            self.port.write(data[i:(i + 2)])
-            self._expect(b'Y', timeout=20)
+            write(data_view[i:(i + 2)])
+            expect(b'Y', timeout=20)
         # We must send an extra two bytes, which will have no effect.
         # Why?  I'm not sure.  See protocol doc, and read it backwards.
         # I'm sending zeros because if we did wind up back at the
@@ -278,29 +327,28 @@ class ProtocolInterface:
     def program_id_fuses(self, pic_id: bytes, fuses: List[int]) -> bool:
         """Program PIC ID and fuses.  For 16-bit processors, fuse values
         are not committed until program_18fxxxx_fuse() is called."""
-        cmd = 9
+        cmd = b'\x09'
         self._need_chip_info()
 
-        core_bits = self.chip_info.get_core_bits() # type: ignore
-        if core_bits == 16:
+        # Body has fixed size of 24 bytes for both cores, packed in one go.
+        # Command starts with dual '0' (ASCII)
+        if self._core_bits == 16:
             if len(pic_id) != 8:
                 raise InvalidValueError('Should have 8-byte ID for 16 bit core.')
             if len(fuses) != 7:
                 raise InvalidValueError('Should have 7 fuses for 16 bit core.')
-            command_body = b'00' + pic_id + struct.pack('<HHHHHHH', *fuses)
+            command_body = self._id_fuses_16_bit_struct.pack(b'00', pic_id, *fuses)
             response_ok = b'Y'
         else:
             if len(fuses) != 1:
                 raise InvalidValueError('Should have one fuse for 14 bit core.')
             if len(pic_id) != 4:
                 raise InvalidValueError('Should have 4-byte ID for 14 bit core.')
-            # Command starts with dual '0' for 14 bit
-            command_body = (b'00' + pic_id + b'FFFF' + struct.pack('<H', fuses[0]) + (b'\xff\xff' * 6))
+            command_body = self._id_fuses_14_bit_struct.pack(b'00', pic_id, b'FFFF', fuses[0], self._id_fuses_14_bit_trailer)
             response_ok = b'Y'
 
         self._command_start()
-        self._set_programming_voltages_command(True)
-        self.port.write(cmd.to_bytes(1, 'little'))
+        self._set_programming_voltages_command(True, cmd)
         self.port.write(command_body)
 
         response = self._read(timeout=20)
@@ -323,12 +371,11 @@ class ProtocolInterface:
         Returns:
 
         """
-        cmd = 10
+        cmd = b'\x0a'
         self._need_chip_info()
 
         self._command_start()
-        self._set_programming_voltages_command(True)
-        self.port.write(cmd.to_bytes(1, 'little'))
+        self._set_programming_voltages_command(True, cmd)
 
         # Calibration High (Byte)
         # Calibration Low  (Byte)
@@ -347,15 +394,14 @@ class ProtocolInterface:
 
     def read_rom(self) -> bytes:
         """Returns contents of PIC ROM as a string of big-endian values."""
-        cmd = 11
+        cmd = b'\x0b'
         self._need_chip_info()
 
-        # vars['rom_size'] is in words.  So multiply by two to get bytes.
-        rom_size = self.chip_info.programming_vars.rom_size * 2  # type: ignore
+        # rom_size is in words.  So multiply by two to get bytes.
+        rom_size = self._rom_size * 2
 
         self._command_start()
-        self._set_programming_voltages_command(True)
-        self.port.write(cmd.to_bytes(1, 'little'))
+        self._set_programming_voltages_command(True, cmd)
 
         response = self._read(rom_size, timeout=180)
         self._set_programming_voltages_command(False)
@@ -364,25 +410,22 @@ class ProtocolInterface:
 
     def read_eeprom(self) -> bytes:
         """Returns data stored in PIC EEPROM."""
-        cmd = 12
+        cmd = b'\x0c'
         self._need_chip_info()
 
-        eeprom_size = self.chip_info.programming_vars.eeprom_size  # type: ignore
-
         self._command_start()
-        self._set_programming_voltages_command(True)
-        self.port.write(cmd.to_bytes(1, 'little'))
-        response = self._read(eeprom_size)
+        self._set_programming_voltages_command(True, cmd)
+        response = self._read(self._eeprom_size)
         self._set_programming_voltages_command(False)
         self._command_end()
         return response
 
     def read_config(self) -> dict:
         """Reads chip ID and programmed ID, fuses, and calibration."""
-        cmd = 13
+        cmd = b'\x0d'
+        self._need_chip_info()
         self._command_start()
-        self._set_programming_voltages_command(True)
-        self.port.write(cmd.to_bytes(1, 'little'))
+        self._set_programming_voltages_command(True, cmd)
         ack = self._read(1)
         if ack != b'C':
             raise InvalidResponseError('No acknowledgement from read_config()')
@@ -390,21 +433,20 @@ class ProtocolInterface:
         self._set_programming_voltages_command(False)
         self._command_end()
 
-        config = struct.unpack('<HccccccccHHHHHHHH', response)
-        result = {'chip_id': config[0],
-                  'id': b''.join(config[1:9]),
-                  'fuses': list(config[9:16]),
-                  'calibrate': config[16]}
+        chip_id, pic_id, *fuses, calibrate = self._config_struct.unpack(response)
+        result = {'chip_id': chip_id,
+                  'id': pic_id,
+                  'fuses': fuses,
+                  'calibrate': calibrate}
         return result
 
     def erase_chip(self) -> bool:
         """Erases all data from chip."""
-        cmd = 14
+        cmd = b'\x0e'
         self._need_chip_info()
 
         self._command_start()
-        self._set_programming_voltages_command(True)
-        self.port.write(cmd.to_bytes(1, 'little'))
+        self._set_programming_voltages_command(True, cmd)
         response = self._read(1)
         self._set_programming_voltages_command(False)
         self._command_end()
@@ -412,32 +454,30 @@ class ProtocolInterface:
 
     def rom_is_blank(self, high_byte: bytes) -> bool:
         """Returns True if PIC ROM is blank."""
-        cmd = 15
+        cmd = b'\x0f'
         self._need_chip_info()
 
-        expected_b_bytes = (self.chip_info.programming_vars.rom_size // 256) - 1  # type: ignore
+        expected_b_bytes = (self._rom_size // 256) - 1
         self._command_start(cmd)
         self.port.write(high_byte)
         while True:
-            response = self._read(1)
-            if response == b'Y':
-                self._command_end()
-                return True
-            if response == b'N':
-                self._command_end()
-                return False
-            if response == b'C':
-                self._command_end()
-                return False
-            if response == b'B':
-                if expected_b_bytes <= 0:
-                    raise InvalidResponseError('Received wrong number of "B" bytes in rom_is_blank()')
-            else:
+            # Progress bytes keep coming while the ROM is checked, take all that are waiting at once
+            response = self._read(max(1, self.port.in_waiting))
+            response_end = response.lstrip(b'B')
+            if len(response_end) != len(response) and expected_b_bytes <= 0:
+                raise InvalidResponseError('Received wrong number of "B" bytes in rom_is_blank()')
+            if response and not response_end:
+                continue
+
+            result = self._rom_is_blank_results.get(response_end)
+            if result is None:
                 raise InvalidResponseError('Unexpected byte in rom_is_blank(): {!r}'.format(response))
+            self._command_end()
+            return result
 
     def eeprom_is_blank(self) -> bool:
         """Returns True if PIC EEPROM is blank."""
-        cmd = 16
+        cmd = b'\x10'
         self._command_start(cmd)
         response = self._read(1)
         self._command_end()
@@ -448,14 +488,13 @@ class ProtocolInterface:
 
     def program_18fxxxx_fuse(self, fuses: List[int]) -> bool:
         """Commits fuse values previously loaded using program_id_fuses()"""
-        cmd = 17
+        cmd = b'\x11'
         self._need_chip_info()
         self._need_fuses()
 
-        command_body = (b'\x00'*10) + struct.pack('<HHHHHHH', *fuses)  # send all 0 in id, and then the fuse values
+        command_body = self._fuses_18fxxxx_struct.pack(*fuses)  # send all 0 in id, and then the fuse values
         self._command_start()
-        self._set_programming_voltages_command(True)
-        self.port.write(cmd.to_bytes(1, 'little'))
+        self._set_programming_voltages_command(True, cmd)
         self.port.write(command_body)
         # It appears the command will return 'B' on chips for which
         # this isn't appropriate?
@@ -468,7 +507,7 @@ class ProtocolInterface:
 
     def wait_until_chip_in_socket(self) -> bool:
         """Blocks until a chip is inserted in the programming socket."""
-        cmd = 18
+        cmd = b'\x12'
         self._command_start(cmd)
         self._expect(b'A')
 
@@ -478,7 +517,7 @@ class ProtocolInterface:
 
     def wait_until_chip_out_of_socket(self) -> bool:
         """Blocks until chip is removed from programming socket."""
-        cmd = 19
+        cmd = b'\x13'
 
         self._command_start(cmd)
         self._expect(b'A')
@@ -489,16 +528,16 @@ class ProtocolInterface:
 
     def programmer_firmware_version(self) -> bytes:
         """Returns the PIC programmer's numeric firmware version."""
-        cmd = 20
+        cmd = b'\x14'
         self._command_start(cmd)
         response = self._read(1)
         self._command_end()
-        result, = struct.unpack('B', response)
+        result, = self._byte_struct.unpack(response)
         return result
 
     def programmer_protocol(self) -> bytes:
         """Returns the PIC programmer's protocol version in text form."""
-        cmd = 21
+        cmd = b'\x15'
         self._command_start(cmd)
         # Protocol doc isn't clear on the format of command 22's output.
         # Presumably it will always be exactly 4 bytes.
@@ -506,12 +545,13 @@ class ProtocolInterface:
         self._command_end()
         return response
 
-    def program_debug_vector(self, address: bytes) -> bool:
+    def program_debug_vector(self, address: int) -> bool:
         """Sets the PIC's debugging vector."""
-        cmd = 22
+        cmd = b'\x16'
         self._need_chip_info()
 
-        be4_address = struct.pack('>I', address)
+        # Vector is sent as a 3-byte big-endian address
+        be4_address = self._address_struct.pack(address)
         self._command_start(cmd)
         self.port.write(be4_address[1:4])
         response = self._read(1)
@@ -522,15 +562,15 @@ class ProtocolInterface:
 
         return response == b'Y'
 
-    def read_debug_vector(self) -> bytes:
+    def read_debug_vector(self) -> int:
         """Returns the value of the PIC's debugging vector."""
-        cmd = 23
+        cmd = b'\x17'
         self._need_chip_info()
 
         self._command_start(cmd)
         response = self._read(4)
         be4_address = b'\x00' + response[1:4]
-        result, = struct.unpack('>I', be4_address)
+        result, = self._address_struct.unpack(be4_address)
         self._command_end()
 
         return result
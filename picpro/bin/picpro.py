@@ -34,13 +34,14 @@ Options:
     -o HEX_FILE --hex_file=HEX_FILE  Hex file to write.
 """
 
+import io
 import os.path
 import struct
 import sys
 import signal
 import json
-from functools import wraps
-from typing import Union, Optional, Callable, Tuple
+from functools import wraps, lru_cache
+from typing import Union, Optional, Callable, Tuple, Dict
 import serial
 from intelhex import IntelHex
 from docopt import docopt
@@ -49,29 +50,53 @@ from picpro.IChipInfoEntry import IChipInfoEntry
 from picpro.HexFileReader import HexFileReader
 from picpro.ProtocolInterface import ProtocolInterface
 from picpro.exceptions import FuseError, InvalidResponseError
-from picpro.tools import range_filter_records, swab_record, merge_records, swab_bytes
+from picpro.tools import range_filter_records, swab_record, merge_records, swab_bytes, is_little_endian
 import picpro as app_root
 
 APP_ROOT_FOLDER = os.path.abspath(os.path.dirname(app_root.__file__))
 
-OPTIONS = docopt(__doc__)
+# Hex file address ranges (base, end) of memory regions, by core bits
+_MEMORY_MAP_12_14_BIT = {
+    'rom': (0x0000, 0x4000),
+    'config': (0x4000, 0x4010),
+    'eeprom': (0x4200, 0xffff)
+}
+MEMORY_MAP = {
+    12: _MEMORY_MAP_12_14_BIT,
+    14: _MEMORY_MAP_12_14_BIT,
+    16: {
+        'rom': (0x0000, 0x8000),
+        'config': (0x300000, 0x30000e),
+        'eeprom': (0xf000, 0xf0ff),
+        'id': (0x200000, 0x200010)
+    }
+}
+
+# Big-endian word, as ROM words are sent to the programmer
+_WORD_STRUCT = struct.Struct('>H')
+
+# Parsed command line, filled in by main() so that importing this module doesn't parse sys.argv
+OPTIONS: dict = {}
+# Functions registered with @command, by command name
+COMMANDS: Dict[str, Callable] = {}
 
 
 def command(name: Optional[str] = None) -> Callable:
     """Decorator that registers the chosen command/function.
 
+    Commands are only registered here, the command line is parsed by main().
+
     If a function is decorated with @command but that function name is not a valid "command" according to the docstring,
-    a KeyError will be raised, since that's a bug in this script.
+    main() will raise a KeyError, since that's a bug in this script.
 
-    If a user doesn't specify a valid command in their command line arguments, the above docopt(__doc__) line will print
-    a short summary and call sys.exit() and stop up there.
+    If a user doesn't specify a valid command in their command line arguments, the docopt(__doc__) call in main() will
+    print a short summary and call sys.exit() and stop up there.
 
     If a user specifies a valid command, but for some reason the developer did not register it, an AttributeError will
     raise, since it is a bug in this script.
 
     Finally, if a user specifies a valid command and it is registered with @command below, then that command is "chosen"
-    by this decorator function, and set as the attribute `chosen`. It is then executed below in
-    `if __name__ == '__main__':`.
+    by main(), set as the attribute `chosen` of this decorator function and executed.
 
     Positional arguments:
     func -- the function to decorate
@@ -85,11 +110,8 @@ def command(name: Optional[str] = None) -> Callable:
 
         command_name = name if name else func.__name__
 
-        # Register chosen function.
-        if command_name not in OPTIONS:
-            raise KeyError('Cannot register {}, not mentioned in docstring/docopt.'.format(command_name))
-        if OPTIONS[command_name]:
-            command.chosen = func  # type: ignore
+        # Register function, it is checked against the docstring once the command line is parsed.
+        COMMANDS[command_name] = func
 
         return wrapped
 
@@ -158,8 +180,11 @@ def dump() -> None:
     intel_hex = IntelHex()
     intel_hex.frombytes(content)
 
-    with open(output_file, 'wb') as file:
-        intel_hex.write_hex_file(file)
+    # IntelHex writes text line by line, format it in memory and write the file at once
+    hex_text = io.StringIO()
+    intel_hex.write_hex_file(hex_text)
+    with open(output_file, 'w', encoding='ascii') as file:
+        file.write(hex_text.getvalue())
 
 
 @command()
@@ -184,11 +209,12 @@ def chipinfo() -> None:
     pic_type = OPTIONS['<PIC_TYPE>']
     # Get chip info
     chip_info_filename = find_chip_data()
-    chip_info_reader = ChipInfoReader(chip_info_filename)
 
     if pic_type:
-        data = chip_info_reader.get_chip(pic_type).to_dict()
+        # Only block of the requested chip needs to be parsed
+        data = ChipInfoReader(chip_info_filename, pic_type).get_chip(pic_type).to_dict()
     else:
+        chip_info_reader = load_chip_info_reader(chip_info_filename)
         data = {chip_name: entry.to_dict() for chip_name, entry in chip_info_reader.chip_entries.items()}
 
     print(json.dumps(data))
@@ -209,7 +235,7 @@ def hexinfo() -> None:
         # Get chip info
     chip_info_filename = find_chip_data()
     try:
-        chip_info_reader = ChipInfoReader(chip_info_filename)
+        chip_info_reader = load_chip_info_reader(chip_info_filename)
     except IOError:
         print('Unable to locate chipinfo.cid file.')
         print('Please verify that file is present in the same directory as this script, '
@@ -259,7 +285,9 @@ def hexinfo() -> None:
     return None
 
 
+@lru_cache(maxsize=None)
 def find_chip_data() -> str:
+    # Search paths don't change while running, the lookup is done once
     path_list = [
         os.path.join('/', 'usr', 'share', 'picpro', 'chipdata.cid'),
         os.path.abspath(os.path.join(APP_ROOT_FOLDER, '..', 'usr', 'share', 'picpro', 'chipdata.cid')),
@@ -274,12 +302,29 @@ def find_chip_data() -> str:
             # windows path
             path_list.append(os.path.abspath(os.path.join(local_app_data, 'picpro', 'chipdata.cid')))
 
-    chip_data_files = [f for f in path_list if os.path.exists(f)]
+    # First existing file wins, no need to check the rest
+    chip_data_file = next((f for f in path_list if os.path.exists(f)), None)
 
-    if len(chip_data_files) == 0:
+    if chip_data_file is None:
         raise ValueError('chipdata.cid was not found in any search path')
 
-    return chip_data_files[0]
+    return chip_data_file
+
+
+@lru_cache(maxsize=4)
+def _load_chip_info_reader(file_name: str, _mtime_ns: int) -> ChipInfoReader:
+    return ChipInfoReader(file_name)
+
+
+def load_chip_info_reader(file_name: str) -> ChipInfoReader:
+    """Returns parsed chip info file, file is parsed again only when it has been modified."""
+    return _load_chip_info_reader(file_name, os.stat(file_name).st_mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def blank_data(blank_unit: bytes, count: int) -> bytes:
+    """Returns blank_unit repeated count times, result is immutable so it is shared between calls."""
+    return blank_unit * count
 
 
 def programmer_common_bootstrap(port: str, pic_type: str, icsp_mode: bool) -> Union[None, tuple]:
@@ -314,7 +359,7 @@ def programmer_common_bootstrap(port: str, pic_type: str, icsp_mode: bool) -> Un
     # Get chip info
     chip_info_filename = find_chip_data()
     try:
-        chip_info_reader = ChipInfoReader(chip_info_filename)
+        chip_info_reader = load_chip_info_reader(chip_info_filename)
     except IOError:
         print('Unable to locate chipinfo.cid file.')
         print('Please verify that file is present in the same directory as this script, '
@@ -353,65 +398,31 @@ def prepare_flash_data_from_hex_file(
     core_bits = chip_info.get_core_bits()
     rom_blank_word = 0xffff << core_bits
     rom_blank_word = ~rom_blank_word & 0xffff
-    rom_blank_bytes = struct.pack('>H', rom_blank_word)
-    rom_blank = rom_blank_bytes * chip_info.programming_vars.rom_size
+    rom_blank_bytes = _WORD_STRUCT.pack(rom_blank_word)
+    rom_blank = blank_data(rom_blank_bytes, chip_info.programming_vars.rom_size)
 
     eeprom_blank_byte = b'\xff'
-    eeprom_blank = eeprom_blank_byte * chip_info.programming_vars.eeprom_size
+    eeprom_blank = blank_data(eeprom_blank_byte, chip_info.programming_vars.eeprom_size)
 
-    if core_bits == 16:
-        rom_word_base = 0x0000
-        rom_word_end = 0x8000
-        eeprom_word_base = 0xf000
-        eeprom_word_end = 0xf0ff
-        config_word_base = 0x300000
-        config_word_end = 0x30000e
-        id_word_base = 0x200000
-        id_word_end = 0x200010
-    else:
-        rom_word_base = 0x0000
-        config_word_base = 0x4000
-        eeprom_word_base = 0x4200
-        rom_word_end = config_word_base
-        config_word_end = 0x4010
-        eeprom_word_end = 0xffff
+    memory_map = MEMORY_MAP[core_bits]
+    eeprom_word_base = memory_map['eeprom'][0]
 
     # Filter hex file data into ROM, config, and EEPROM:
-    rom_records = range_filter_records(hex_file.records, rom_word_base, rom_word_end)
-    config_records = range_filter_records(hex_file.records, config_word_base, config_word_end)
+    rom_records = range_filter_records(hex_file.records, *memory_map['rom'])
+    config_records = range_filter_records(hex_file.records, *memory_map['config'])
 
     if core_bits == 16:
-        id_records = range_filter_records(hex_file.records, id_word_base, id_word_end)
+        id_records = range_filter_records(hex_file.records, *memory_map['id'])
 
-    eeprom_records = range_filter_records(hex_file.records, eeprom_word_base, eeprom_word_end)
+    eeprom_records = range_filter_records(hex_file.records, *memory_map['eeprom'])
 
     # Try to detect whether the ROM data is big-endian or
     # little-endian.  If it is little-endian, swap bytes.
-    swap_bytes = None
+    swap_bytes: Optional[bool]
     if core_bits == 16:
         swap_bytes = True
     else:
-        for record in rom_records:
-            if record[0] % 2 != 0:
-                raise ValueError('ROM record starts on odd address.')
-            for x in range(0, len(record[1]), 2):
-                if (x + 2) < len(record[1]):
-                    be_word, = struct.unpack('>H', record[1][x:x + 2])
-                    le_word, = struct.unpack('<H', record[1][x:x + 2])
-
-                    be_ok = (be_word & rom_blank_word) == be_word
-                    le_ok = (le_word & rom_blank_word) == le_word
-
-                    if be_ok and not le_ok:
-                        swap_bytes = False
-                        break
-                    if le_ok and not be_ok:
-                        swap_bytes = True
-                        break
-                    if not (le_ok or be_ok):
-                        raise ValueError('Invalid ROM word: {}, ROM blank: {}'.format(hex(le_word), hex(rom_blank_word)))
-            if swap_bytes is not None:
-                break
+        swap_bytes = is_little_endian(rom_records, rom_blank_word)
 
     if swap_bytes:
         rom_records = [*map(swab_record, rom_records)]
@@ -428,10 +439,10 @@ def prepare_flash_data_from_hex_file(
     else:
         pick_byte = 1
 
-    def _map_records(eeprom_record: Tuple[int, bytearray]) -> Tuple[int, bytearray]:
+    def _map_records(eeprom_record: Tuple[int, bytes]) -> Tuple[int, bytes]:
         return (
-            int(eeprom_word_base + ((eeprom_record[0] - eeprom_word_base) / 2)),
-            (bytearray([eeprom_record[1][record_index] for record_index in range(pick_byte, len(eeprom_record[1]), 2)]))
+            eeprom_word_base + (eeprom_record[0] - eeprom_word_base) // 2,
+            eeprom_record[1][pick_byte::2]
         )
 
     eeprom_records = [*map(_map_records, eeprom_records)]
@@ -455,10 +466,10 @@ def prepare_flash_data_from_hex_file(
         # Config records are already converted to little-endian, so we set
         # range(pick_byte, 8, 2) to range(1, 8, 2)
         if core_bits != 16:
-            id_data = bytearray([id_data[x] for x in range(1, 8, 2)])
+            id_data = id_data[1:8:2]
 
     # Pull fuse data from config records
-    fuse_data_blank = b''.join(map(lambda word: struct.pack('>H', word), chip_info.programming_vars.fuse_blank))
+    fuse_data_blank = chip_info.fuse_blank_data()
     if core_bits == 16:
         fuse_config = range_filter_records(
             config_records,
@@ -485,9 +496,7 @@ def prepare_flash_data_from_hex_file(
     # Go through each fuse listed in chip info.
     # Determine its current setting in fuse_value, and accumulate a new
     # fuse_value by incorporating values specified in (fuses).
-    fuse_values = [int(struct.unpack('>H', fuse_data[x:x + 2])[0]) for x in range(0, len(fuse_data), 2)]
-    # for i in xrange(0, len(fuse_blank)):
-    # fuse_value[i] = struct.unpack('>H', fuse_data[i*2, i*2+2])
+    fuse_values = list(struct.unpack('>{}H'.format(len(fuse_data) // 2), fuse_data))
     if fuses:
         fuse_settings = chip_info.decode_fuse_data(fuse_values)
         fuse_settings.update(fuses)
@@ -536,7 +545,8 @@ def program_pic(
         if chip_info.programming_vars.flag_calibration_value_in_rom:
             # Some chips have cal data put on last two bytes of ROM dump
             print('CAL is in ROM data, patching ROM to contain CAL data...')
-            rom_data = rom_data[:len(rom_data) - 2] + chip_config.get('calibrate').to_bytes(2, 'big')
+            # ROM data is a bytearray from merge_records(), patch it in place instead of copying it
+            rom_data[-2:] = chip_config['calibrate'].to_bytes(2, 'big')
 
         if is_program:
             # Write ROM, EEPROM, ID and fuses
@@ -607,6 +617,15 @@ def program_pic(
 
 def main() -> None:
     signal.signal(signal.SIGINT, lambda *_: sys.exit(0))  # Properly handle Control+C
+    OPTIONS.update(docopt(__doc__))
+
+    # Choose registered function.
+    for command_name, func in COMMANDS.items():
+        if command_name not in OPTIONS:
+            raise KeyError('Cannot register {}, not mentioned in docstring/docopt.'.format(command_name))
+        if OPTIONS[command_name]:
+            command.chosen = func  # type: ignore
+
     getattr(command, 'chosen')()  # Execute the function specified by the user.
 
 
@@ -1,4 +1,5 @@
-from typing import Tuple
+import struct
+from typing import Tuple, Optional
 
 
 def indexwise_and(fuses: list, setting_values: list) -> list:
@@ -12,24 +13,41 @@ def indexwise_and(fuses: list, setting_values: list) -> list:
 
 
 def swab_bytes(to_swab: bytes) -> bytearray:
-    result = bytearray()
-    for x in range(0, len(to_swab), 2):
-        result.append(to_swab[x + 1])
-        result.append(to_swab[x])
+    """Return a copy of to_swab with the two bytes of every word swapped."""
+    result = bytearray(len(to_swab))
+    result[0::2] = to_swab[1::2]
+    result[1::2] = to_swab[0::2]
 
     return result
 
 
 def swab_record(record: list) -> Tuple[int, bytearray]:
     """Given a record from a hex file, return a new copy with adjacent data bytes swapped."""
-    #result = bytearray()
-    #for x in range(0, len(record[1]), 2):
-    #    result.append(record[1][x + 1])
-    #    result.append(record[1][x])
-
     return record[0], swab_bytes(record[1])
 
 
+def is_little_endian(records: list, rom_blank_word: int) -> Optional[bool]:
+    """Given a list of ROM records, detect whether the data is little-endian by finding the first word
+    that is valid (fits into rom_blank_word) in one byte order only. Returns None when no word decides it."""
+    for record in records:
+        if record[0] % 2 != 0:
+            raise ValueError('ROM record starts on odd address.')
+
+        # Unpack all complete words of the record at once, in both byte orders, without copying the record
+        data = memoryview(record[1])[:len(record[1]) & ~1]
+        for (be_word,), (le_word,) in zip(struct.iter_unpack('>H', data), struct.iter_unpack('<H', data)):
+            be_ok = (be_word & rom_blank_word) == be_word
+            le_ok = (le_word & rom_blank_word) == le_word
+
+            if be_ok != le_ok:
+                # Word fits in one byte order only, that decides it
+                return le_ok
+            if not le_ok:
+                raise ValueError('Invalid ROM word: {}, ROM blank: {}'.format(hex(le_word), hex(rom_blank_word)))
+
+    return None
+
+
 def range_filter_records(records: list, lower_bound: int, upper_bound: int) -> list:
     """Given a list of HEX file records, return a new list of HEX file records containing only the HEX data within the specified address range."""
     result = []
@@ -61,8 +79,8 @@ def range_filter_records(records: list, lower_bound: int, upper_bound: int) -> l
 
 def merge_records(records: list, default_data: bytes, base_address: int = 0) -> bytearray:
     """Given a list of HEX file records and a data buffer with its own base address (default=0), merge the HEX file records into a new copy of the data buffer."""
-    result_list = bytearray()
-    mark = 0
+    # Start with a copy of default_data and overwrite it with record data.
+    result = bytearray(default_data)
     for record in records:
         if record[0] < base_address:
             raise IndexError('Record address out of range.')
@@ -71,16 +89,6 @@ def merge_records(records: list, default_data: bytes, base_address: int = 0) ->
             raise IndexError('Record out of range.')
 
         point = record[0] - base_address
-        if mark != point:
-            result_list += default_data[mark:point]
-            mark = point
-        # Now we can add the record data to result_list.
-        result_list += record[1]
-        mark += len(record[1])
-    # Fill out the rest of the result with data from default_data, if
-    # necessary.
-    if mark < len(default_data):
-        result_list += default_data[mark:]
-
-    # String-join result_list and return.
-    return result_list
+        result[point:point + len(record[1])] = record[1]
+
+    return result
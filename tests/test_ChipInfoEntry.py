@@ -0,0 +1,65 @@
+import os
+import pytest
+from picpro.ChipInfoEntry import ChipInfoEntry
+from picpro.ChipInfoReader import ChipInfoReader
+from picpro.exceptions import FuseError
+
+
+@pytest.fixture(scope="function")  # type: ignore
+def chip_info() -> ChipInfoEntry:
+    this_dir = os.path.dirname(os.path.realpath(__file__))
+    return ChipInfoReader(os.path.join(this_dir, 'test_chip_data.cid')).get_chip('16f737')
+
+
+def test_encode_fuse_data(chip_info: ChipInfoEntry) -> None:
+    fuse_values = chip_info.encode_fuse_data({
+        'WDT': 'Disabled',
+        'BOREN': 'Sleep OFF',
+        'Clock Monitor': 'Disabled'
+    })
+
+    assert fuse_values == [0x3ffb, 0x3fbe]
+    assert chip_info.fuse_blank == [0x3fff, 0x3fff]
+
+
+def test_encode_fuse_data_invalid(chip_info: ChipInfoEntry) -> None:
+    with pytest.raises(FuseError):
+        chip_info.encode_fuse_data({'WDT': 'Maybe'})
+
+    with pytest.raises(FuseError):
+        chip_info.encode_fuse_data({'Muhehe': 'Enabled'})
+
+
+def test_fuse_doc(chip_info: ChipInfoEntry) -> None:
+    fuse_doc = chip_info.fuse_doc().splitlines()
+
+    assert len(fuse_doc) == len(chip_info.fuses)
+    assert fuse_doc[0] == '\'WDT\' : (\'Enabled\', \'Disabled\')'
+    assert fuse_doc[3] == '\'BOREN\' : (\'Enabled\', \'Sleep OFF\', \'SBOREN\', \'Disabled\')'
+
+
+def test_decode_fuse_data(chip_info: ChipInfoEntry) -> None:
+    fuse_settings = chip_info.decode_fuse_data([0x3ffb, 0x3fbe])
+
+    assert fuse_settings['WDT'] == 'Disabled'
+    assert fuse_settings['BOREN'] == 'Sleep OFF'
+    assert fuse_settings['Clock Monitor'] == 'Disabled'
+    assert fuse_settings['Code Protect'] == 'Disabled'
+
+
+def test_decode_fuse_data_most_specific_setting(chip_info: ChipInfoEntry) -> None:
+    for fuse, setting in [('Oscillator', 'INTRC_IO'), ('Oscillator', 'LP'), ('Brownout Voltage', '4.5V')]:
+        fuse_settings = chip_info.decode_fuse_data(chip_info.encode_fuse_data({fuse: setting}))
+
+        assert fuse_settings[fuse] == setting
+
+
+def test_fuse_blank_data(chip_info: ChipInfoEntry) -> None:
+    assert chip_info.fuse_blank_data() == b'\x3f\xff\x3f\xff'
+
+
+def test_decode_fuse_data_wrong_length(chip_info: ChipInfoEntry) -> None:
+    with pytest.raises(FuseError):
+        chip_info.decode_fuse_data([16383])
+    with pytest.raises(FuseError):
+        chip_info.decode_fuse_data([16383, 16383, 16383])
@@ -1,6 +1,7 @@
 import os
+from pathlib import Path
 import pytest
-from picpro.ChipInfoReader import ChipInfoReader
+from picpro.ChipInfoReader import ChipInfoReader, handle_fuse_blank
 from picpro.ProgrammingVars import ProgrammingVars
 
 
@@ -165,3 +166,43 @@ def test_get_chip_multiple_fuses(chip_data_path: str) -> None:
     chip_info = chip_info_reader.get_chip('16F737')
 
     assert chip_info.to_dict() == expect
+
+
+def test_chip_entries_not_shared(chip_data_path: str, tmp_path: Path) -> None:
+    with open(chip_data_path, 'r', encoding='UTF-8') as file:
+        first_block = file.read().split('\n\n')[0]
+    other_chip_data_path = os.path.join(tmp_path, 'other_chip_data.cid')
+    with open(other_chip_data_path, 'w', encoding='UTF-8') as file:
+        file.write(first_block + '\n')
+
+    chip_info_reader = ChipInfoReader(chip_data_path)
+    other_chip_info_reader = ChipInfoReader(other_chip_data_path)
+
+    assert list(other_chip_info_reader.chip_entries) == ['10f200']
+    assert list(chip_info_reader.chip_entries) == ['10f200', '16f737']
+
+
+def test_handle_fuse_blank() -> None:
+    assert handle_fuse_blank('3FFF') == [0x3fff]
+    assert handle_fuse_blank(' 3FFF  3fff\t3FFF ') == [0x3fff, 0x3fff, 0x3fff]
+
+
+def test_read_single_chip(chip_data_path: str) -> None:
+    chip_info_reader = ChipInfoReader(chip_data_path)
+    single_chip_info_reader = ChipInfoReader(chip_data_path, '16F737')
+
+    assert list(single_chip_info_reader.chip_entries) == ['16f737']
+    assert single_chip_info_reader.get_chip('16f737') == chip_info_reader.get_chip('16f737')
+    assert not ChipInfoReader(chip_data_path, 'unknown').chip_entries
+
+
+def test_read_single_chip_stops_after_chip(chip_data_path: str, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    with open(chip_data_path, 'r', encoding='UTF-8') as file:
+        first_block = file.read().split('\n\n')[0]
+    # Invalid block after the requested chip is never parsed, so no parse error is logged
+    other_chip_data_path = os.path.join(tmp_path, 'other_chip_data.cid')
+    with open(other_chip_data_path, 'w', encoding='UTF-8') as file:
+        file.write(first_block + '\n\nUnknownKey=1\n')
+
+    assert list(ChipInfoReader(other_chip_data_path, '10f200').chip_entries) == ['10f200']
+    assert not caplog.records
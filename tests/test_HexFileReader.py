@@ -0,0 +1,69 @@
+import os
+from pathlib import Path
+import pytest
+from picpro.HexFileReader import HexFileReader
+from picpro.exceptions import InvalidRecordError, InvalidChecksumError
+
+
+@pytest.fixture(scope="function")  # type: ignore
+def hex_file_path() -> str:
+    this_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(this_dir, 'test_hex_file.hex')
+
+
+def write_hex_file(directory: Path, lines: list) -> str:
+    hex_file_path = os.path.join(directory, 'test.hex')
+    with open(hex_file_path, 'w', encoding='ascii') as file:
+        file.write('\n'.join(lines) + '\n')
+    return hex_file_path
+
+
+def test_records(hex_file_path: str) -> None:
+    hex_file = HexFileReader(hex_file_path)
+
+    assert hex_file.records == [
+        (0x00000, b'\x01\x02\x03\x04'),
+        (0x10010, b'\xaa\xbb')
+    ]
+
+
+def test_merge(hex_file_path: str) -> None:
+    hex_file = HexFileReader(hex_file_path)
+
+    with pytest.raises(IndexError):
+        hex_file.merge(b'\xff' * 8)
+
+    hex_file.records.pop()
+    assert hex_file.merge(b'\xff' * 6) == b'\x01\x02\x03\x04\xff\xff'
+
+
+def test_invalid_checksum(tmp_path: Path) -> None:
+    with pytest.raises(InvalidChecksumError):
+        HexFileReader(write_hex_file(tmp_path, [':0400000001020304F3', ':00000001FF']))
+
+
+def test_invalid_record(tmp_path: Path) -> None:
+    with pytest.raises(InvalidRecordError):
+        HexFileReader(write_hex_file(tmp_path, ['0400000001020304F2', ':00000001FF']))
+
+    with pytest.raises(InvalidRecordError):
+        HexFileReader(write_hex_file(tmp_path, [':04000000010203', ':00000001FF']))
+
+    with pytest.raises(InvalidRecordError):
+        HexFileReader(write_hex_file(tmp_path, [':00000001FF', ':0400000001020304F2']))
+
+
+def test_no_trailing_newline(tmp_path: Path) -> None:
+    hex_file_path = os.path.join(tmp_path, 'test.hex')
+    with open(hex_file_path, 'w', encoding='ascii') as file:
+        file.write(':0400000001020304F2\n:00000001FF')
+
+    assert HexFileReader(hex_file_path).records == [(0, b'\x01\x02\x03\x04')]
+
+
+def test_crlf_and_blank_lines(tmp_path: Path) -> None:
+    hex_file_path = os.path.join(tmp_path, 'test.hex')
+    with open(hex_file_path, 'wb') as file:
+        file.write(b':0400000001020304F2\r\n\r\n:00000001FF\r\n')
+
+    assert HexFileReader(hex_file_path).records == [(0, b'\x01\x02\x03\x04')]
@@ -0,0 +1,62 @@
+import pytest
+from picpro.tools import indexwise_and, swab_bytes, swab_record, range_filter_records, merge_records, is_little_endian
+
+
+def test_indexwise_and() -> None:
+    assert indexwise_and([0x3fff, 0x3fff], [(1, 0x3ffe)]) == [0x3fff, 0x3ffe]
+
+
+def test_swab_bytes() -> None:
+    assert swab_bytes(b'\x01\x02\x03\x04') == b'\x02\x01\x04\x03'
+
+
+def test_swab_record() -> None:
+    assert swab_record([0x10, b'\x01\x02']) == (0x10, b'\x02\x01')
+
+
+def test_range_filter_records() -> None:
+    records = [
+        (0x00, b'\x00\x01\x02\x03'),
+        (0x04, b'\x04\x05\x06\x07'),
+        (0x08, b'\x08\x09\x0a\x0b'),
+        (0x10, b'\x10\x11')
+    ]
+
+    assert range_filter_records(records, 0x02, 0x0a) == [
+        (0x02, b'\x02\x03'),
+        (0x04, b'\x04\x05\x06\x07'),
+        (0x08, b'\x08\x09')
+    ]
+
+
+def test_merge_records() -> None:
+    records = [
+        (0x102, b'\x01\x02'),
+        (0x100, b'\x03')
+    ]
+
+    assert merge_records(records, b'\xff' * 6, 0x100) == b'\x03\xff\x01\x02\xff\xff'
+
+
+def test_merge_records_out_of_range() -> None:
+    with pytest.raises(IndexError):
+        merge_records([(0x00, b'\x01')], b'\xff' * 4, 0x100)
+
+    with pytest.raises(IndexError):
+        merge_records([(0x103, b'\x01\x02')], b'\xff' * 4, 0x100)
+
+
+def test_is_little_endian() -> None:
+    # 0x3fff is only valid 14 bit word when read as big-endian
+    assert is_little_endian([(0x00, b'\x00\x00\x3f\xff')], 0x3fff) is False
+    assert is_little_endian([(0x00, b'\x00\x00'), (0x10, b'\xff\x3f')], 0x3fff) is True
+    # Nothing decides byte order
+    assert is_little_endian([(0x00, b'\x00\x00\x01\x01')], 0x3fff) is None
+
+
+def test_is_little_endian_invalid() -> None:
+    with pytest.raises(ValueError):
+        is_little_endian([(0x01, b'\x00\x00')], 0x3fff)
+
+    with pytest.raises(ValueError):
+        is_little_endian([(0x00, b'\xff\xff')], 0x3fff)